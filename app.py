@@ -7,14 +7,49 @@ Provides REST API endpoints to:
 - Trigger report generation with interactive visualizations
 """
 
-from flask import Flask, jsonify, send_file, request
-import subprocess
+from flask import Flask, Response, abort, jsonify, send_file, request
 import os
-import json
+import time
+import hashlib
+import orjson
+from functools import lru_cache
+
+# Import pipeline modules once at startup so pandas/plotly load a single time
+import subreddit
+import etl
+import interactive_report
 
 # Initialize Flask application
 app = Flask(__name__)
 
+# How long (seconds) the popular subreddits list is served from memory
+SUBREDDITS_TTL = 300
+
+# In-memory cache of the last /get-subreddits response as one immutable
+# (body, etag, mtime) tuple, swapped in a single assignment so threads never
+# see one fetch's body paired with another fetch's ETag
+_cache = None
+
+# How long (seconds) a subreddit's ETL result is reused before re-fetching
+ETL_BUCKET_SECONDS = 3600
+
+@lru_cache(maxsize=32)
+def _cached_etl(key: str, bucket: int) -> str:
+    """
+    Run the ETL for a subreddit at most once per time bucket.
+    
+    Args:
+        key (str): Normalized subreddit key from etl.subreddit_key (e.g. 'india'),
+            so 'r/India', 'r/india' and 'India' share one cache entry
+        bucket (int): Time bucket index (int(time.time() // ETL_BUCKET_SECONDS))
+    
+    Returns:
+        str: Path to the subreddit's own SQLite database
+    """
+    db_path = etl.db_path_for(key)
+    etl.run(key, db_path=db_path)
+    return db_path
+
 @app.route('/')
 def index():
     """
@@ -35,30 +70,68 @@ def report():
     """
     return send_file('interactive_report.html')
 
+@app.route('/report/<key>')
+def subreddit_report(key):
+    """
+    Serve the interactive Plotly report generated for one subreddit.
+    
+    Args:
+        key (str): Subreddit key as returned by etl.subreddit_key (e.g. 'india')
+    
+    Returns:
+        HTML file: report_<key>.html, or 404 if no report was generated yet
+    """
+    # report_path_for re-normalizes the key, so it can never leave the app directory
+    path = etl.report_path_for(key)
+    if not os.path.exists(path):
+        abort(404)
+    return send_file(path)
+
 @app.route('/get-subreddits', methods=['GET'])
 def get_subreddits():
     """
     Fetch and return list of popular subreddits.
     This endpoint:
-    1. Runs subreddit.py to fetch latest subreddit data from Reddit
-    2. Loads the cached subreddit list from subreddits.json
+    1. Serves the in-memory copy if it is younger than SUBREDDITS_TTL
+    2. Otherwise calls subreddit.fetch() to get the latest subreddit data from Reddit
+       (falling back to subreddits.json if the fetch fails)
     3. Returns JSON array of subreddit objects with name, subscribers, and title
     
+    Responses carry an ETag and Last-Modified header, so clients sending
+    If-None-Match / If-Modified-Since get a 304 while the list is unchanged.
+    
     Returns:
         JSON: List of subreddits [{'name': 'r/...', 'subscribers': int, 'title': str}, ...]
-        or 400 error if file not found
+        or 304 if the client copy is current, or 400 error if nothing could be loaded
     """
+    global _cache
     try:
-        # Run subreddit.py to fetch the latest subreddit list from Reddit API
-        result = subprocess.run(['python', 'subreddit.py'], capture_output=True, text=True, timeout=30)
+        # Read the cache entry once so body, ETag and mtime stay consistent
+        entry = _cache
+        
+        # Refresh the cache only once the TTL has expired
+        if entry is None or time.time() - entry[2] >= SUBREDDITS_TTL:
+            try:
+                # Fetch the latest subreddit list from Reddit API (also refreshes subreddits.json)
+                subreddits = subreddit.fetch()
+            except Exception:
+                # Fall back to the cached subreddits from the last successful fetch
+                if not os.path.exists('subreddits.json'):
+                    return jsonify([]), 400
+                with open('subreddits.json', 'rb') as f:
+                    subreddits = orjson.loads(f.read())
+            body = orjson.dumps(subreddits)
+            entry = (body, hashlib.md5(body).hexdigest(), time.time())
+            _cache = entry
         
-        # Load the cached subreddits from the JSON file that subreddit.py creates
-        if os.path.exists('subreddits.json'):
-            with open('subreddits.json', 'r') as f:
-                subreddits = json.load(f)
-            return jsonify(subreddits)
-        else:
-            return jsonify([]), 400
+        # Build the response and let Werkzeug answer conditional requests with 304
+        body, etag, mtime = entry
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.last_modified = mtime
+        response.cache_control.max_age = SUBREDDITS_TTL
+        response.cache_control.must_revalidate = True
+        return response.make_conditional(request)
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
@@ -68,11 +141,13 @@ def run_etl():
     Trigger the ETL pipeline to extract posts from selected subreddit.
     
     Request JSON body:
-        {'subreddit': 'r/SubredditName', 'title': 'Subreddit Title'}
+        {'subreddit': 'r/SubredditName'}
+        (a 'title' field may be sent by the dashboard but is not used)
     
     This endpoint:
-    1. Extracts the subreddit name and title from POST request
-    2. Runs etl.py as a subprocess with these parameters
+    1. Extracts the subreddit name from POST request
+    2. Runs the ETL pipeline in-process into the subreddit's own database
+       (reusing the previous result if the same subreddit ran within the hour)
     3. Returns success/error status
     
     Returns:
@@ -84,22 +159,11 @@ def run_etl():
         data = request.get_json()
         
         # Extract subreddit name (default to 'r/India' if not provided)
-        subreddit = data.get('subreddit', 'r/India') if data else 'r/India'
+        subreddit_name = data.get('subreddit', 'r/India') if data else 'r/India'
         
-        # Extract subreddit title (optional)
-        title = data.get('title', '') if data else ''
-        
-        # Execute etl.py as a subprocess, passing subreddit name and title as arguments
-        result = subprocess.run(['python', 'etl.py', subreddit, title], capture_output=True, text=True, timeout=60)
-        
-        # Check if subprocess executed successfully (return code 0 = success)
-        if result.returncode == 0:
-            return jsonify({'status': 'success', 'message': 'ETL completed'})
-        else:
-            # Return error output from subprocess
-            return jsonify({'status': 'error', 'error': result.stderr}), 400
-    except subprocess.TimeoutExpired:
-        return jsonify({'status': 'error', 'error': 'Timeout'}), 400
+        # Run the ETL pipeline, or reuse this hour's result for the subreddit
+        _cached_etl(etl.subreddit_key(subreddit_name), int(time.time() // ETL_BUCKET_SECONDS))
+        return jsonify({'status': 'success', 'message': 'ETL completed'})
     except Exception as e:
         return jsonify({'status': 'error', 'error': str(e)}), 400
 
@@ -108,27 +172,30 @@ def run_report():
     """
     Trigger interactive report generation with Plotly visualizations.
     
+    Request JSON body (optional):
+        {'subreddit': 'r/SubredditName'}
+    
     This endpoint:
-    1. Runs interactive_report.py as a subprocess
+    1. Runs the interactive report generator in-process on the subreddit's database
     2. Generates interactive bar charts showing top posts by upvotes and comments
-    3. Creates interactive_report.html with clickable post links
+    3. Creates the subreddit's own report_<name>.html with clickable post links
     
     Returns:
-        JSON: {'status': 'success', 'message': '...'} on success
+        JSON: {'status': 'success', 'message': '...', 'url': '/report/<name>'} on success
         or {'status': 'error', 'error': '...'} on failure (400 status code)
     """
     try:
-        # Execute interactive_report.py as a subprocess
-        result = subprocess.run(['python', 'interactive_report.py'], capture_output=True, text=True, timeout=60)
+        # Parse JSON request body (may be empty)
+        data = request.get_json(silent=True)
+        
+        # Extract subreddit name (default to 'r/India' if not provided)
+        subreddit_name = data.get('subreddit', 'r/India') if data else 'r/India'
         
-        # Check if subprocess executed successfully
-        if result.returncode == 0:
-            return jsonify({'status': 'success', 'message': 'Report generated'})
-        else:
-            # Return error output from subprocess
-            return jsonify({'status': 'error', 'error': result.stderr}), 400
-    except subprocess.TimeoutExpired:
-        return jsonify({'status': 'error', 'error': 'Timeout'}), 400
+        # Generate the report into the subreddit's own file, so concurrent
+        # reports for different subreddits don't overwrite one another
+        interactive_report.generate(etl.db_path_for(subreddit_name), etl.report_path_for(subreddit_name))
+        return jsonify({'status': 'success', 'message': 'Report generated',
+                        'url': f"/report/{etl.subreddit_key(subreddit_name)}"})
     except Exception as e:
         return jsonify({'status': 'error', 'error': str(e)}), 400
 
@@ -5,17 +5,47 @@ transforms the data, and loads it into a SQLite database.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import re
+import orjson
 import pandas as pd
-from sqlalchemy import create_engine
+import sqlite3
 import sys
 
-def extract_data(subreddit='r/India', title='')-> dict:
+# Post fields kept from the Reddit API response (in table column order)
+COLUMNS = ['id', 'score', 'ups', 'downs', 'upvote_ratio', 'num_comments', 'title', 'author',
+           'permalink', 'subreddit_name_prefixed', 'url', 'created_utc']
+
+# Narrow nullable numeric dtypes for the post columns, so missing fields stay NULL
+# (created_utc kept exact as Int64; upvote_ratio stays 64-bit since SQLite REAL is anyway)
+DTYPES = {'score': 'Int32', 'ups': 'Int32', 'downs': 'Int32', 'num_comments': 'Int32',
+          'upvote_ratio': 'Float64', 'created_utc': 'Int64'}
+
+# Shared HTTP session so the Reddit TCP/TLS connection is reused across ETL runs
+_SESSION = requests.Session()
+
+# Set User-Agent header (required by Reddit API) and ask for a compressed body
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Encoding': 'gzip, deflate'
+})
+
+# Pool connections and retry transient failures / rate limiting with backoff
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+def extract_data(subreddit='r/India', title='', pages=1)-> dict:
     """
     Extract data from Reddit's public API.
     
     Args:
         subreddit (str): Subreddit name to fetch posts from (with or without 'r/' prefix)
         title (str): Subreddit title (for logging purposes)
+        pages (int): Number of 100-post pages to fetch (follows Reddit's 'after' cursor)
     
     Returns:
         tuple: (list of post data, subreddit title)
@@ -27,15 +57,25 @@ def extract_data(subreddit='r/India', title='')-> dict:
     # Construct Reddit API URL to fetch top 100 posts from the past year
     url = f"https://www.reddit.com/r/{subreddit}/top.json?limit=100&t=year"
     
-    # Set User-Agent header (required by Reddit API)
-    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-    
-    # Make HTTP request to Reddit API
-    response = requests.get(url, headers=headers)
-    data = response.json()
-    
-    # Extract the nested posts list from the API response and return with title
-    return data['data']['children'], title
+    # Page through the listing; each cursor comes from the previous response,
+    # so pages are fetched in order over the same pooled connection
+    posts = []
+    after = None
+    for _ in range(pages):
+        page_url = f"{url}&after={after}" if after else url
+        
+        # Make HTTP request to Reddit API over the pooled session
+        response = _SESSION.get(page_url, timeout=10)
+        data = orjson.loads(response.content)
+        
+        # Collect the nested posts list and stop when there are no more pages
+        posts.extend(data['data']['children'])
+        after = data['data'].get('after')
+        if not after:
+            break
+    
+    # Return the posts with title
+    return posts, title
 
 def transform_data(data: dict) -> pd.DataFrame:
     """
@@ -47,33 +87,126 @@ def transform_data(data: dict) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Cleaned dataframe with selected columns
     """
-    # Convert list of post objects into a DataFrame
-    df = pd.DataFrame([item['data'] for item in data])
+    # Build only the relevant columns we need for analysis
+    # instead of materializing all ~150 Reddit fields and slicing afterwards
+    df = pd.DataFrame.from_records((item['data'] for item in data), columns=COLUMNS)
     
-    # Select only the relevant columns we need for analysis
-    df = df[['id','score', 'ups', 'downs', 'upvote_ratio','num_comments', 'title', 'author', 'permalink','subreddit_name_prefixed', 'url','created_utc']]
+    # Cast numeric columns to explicit narrow dtypes (missing values become <NA>)
+    df = df.astype(DTYPES)
     return df
 
-def load_data(df: pd.DataFrame) -> None:
+def subreddit_key(subreddit: str) -> str:
+    """
+    Normalize a subreddit name into a filename/URL-safe key.
+    
+    Args:
+        subreddit (str): Subreddit name (with or without 'r/' prefix)
+    
+    Returns:
+        str: Lowercase key with only word characters, e.g. 'india' for 'r/India'
+    """
+    if subreddit.startswith('r/'):
+        subreddit = subreddit[2:]
+    
+    # Keep only filename-safe characters
+    return re.sub(r'\W', '_', subreddit.lower())
+
+def db_path_for(subreddit: str) -> str:
+    """
+    Get the SQLite database path holding a single subreddit's posts.
+    
+    Args:
+        subreddit (str): Subreddit name (with or without 'r/' prefix)
+    
+    Returns:
+        str: Database file name, e.g. 'posts_india.db' for 'r/India'
+    """
+    return f"posts_{subreddit_key(subreddit)}.db"
+
+def report_path_for(subreddit: str) -> str:
+    """
+    Get the interactive report path for a single subreddit.
+    
+    Args:
+        subreddit (str): Subreddit name (with or without 'r/' prefix)
+    
+    Returns:
+        str: Report file name, e.g. 'report_india.html' for 'r/India'
+    """
+    return f"report_{subreddit_key(subreddit)}.html"
+
+def _to_sql_rows(df: pd.DataFrame):
+    """
+    Iterate DataFrame rows as tuples of plain Python values for sqlite3.
+    
+    Args:
+        df (pd.DataFrame): DataFrame to convert
+    
+    Returns:
+        iterator: Row tuples with <NA>/NaN replaced by None (stored as NULL)
+    """
+    values = df.astype(object)
+    return values.where(values.notna(), None).itertuples(index=False, name=None)
+
+def load_data(df: pd.DataFrame, db_path='posts.db') -> None:
     """
     Load transformed data into SQLite database.
     
     Args:
         df (pd.DataFrame): DataFrame to load into database
+        db_path (str): SQLite database file to write
     """
-    # Create SQLAlchemy engine for SQLite database connection
-    engine = create_engine('sqlite:///posts.db')
-    
-    # Write DataFrame to 'posts' table, replacing existing data
-    df.to_sql('posts', engine, if_exists='replace', index=False)
+    # Open SQLite database directly (no SQLAlchemy engine / type reflection)
+    con = sqlite3.connect(db_path)
+    try:
+        # WAL lets readers keep reading the previous data while a new load is
+        # written, so report reads never block the ETL write (and vice versa);
+        # NORMAL sync is safe in WAL mode and skips an fsync per commit
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        
+        # Recreate 'posts' table, replacing existing data, in one write transaction
+        # so concurrent loads of the same file are serialized and readers never
+        # see a dropped or half-filled table
+        con.execute("BEGIN IMMEDIATE")
+        con.execute("DROP TABLE IF EXISTS posts")
+        con.execute("""
+        CREATE TABLE posts (
+          id TEXT,
+          score INTEGER,
+          ups INTEGER,
+          downs INTEGER,
+          upvote_ratio REAL,
+          num_comments INTEGER,
+          title TEXT,
+          author TEXT,
+          permalink TEXT,
+          subreddit_name_prefixed TEXT,
+          url TEXT,
+          created_utc INTEGER
+        )
+        """)
+        
+        # Bulk insert all rows
+        placeholders = ','.join('?' * len(COLUMNS))
+        con.executemany(f"INSERT INTO posts VALUES ({placeholders})",
+                        _to_sql_rows(df[COLUMNS]))
+        con.commit()
+    finally:
+        con.close()
 
-if __name__ == "__main__":
-    # Get subreddit name from command line argument (default: 'r/India')
-    subreddit = sys.argv[1] if len(sys.argv) > 1 else 'r/India'
+def run(subreddit='r/India', title='', db_path='posts.db') -> str:
+    """
+    Run the full ETL pipeline for a subreddit.
     
-    # Get subreddit title from command line argument (optional)
-    title = sys.argv[2] if len(sys.argv) > 2 else ''
+    Args:
+        subreddit (str): Subreddit name to fetch posts from (with or without 'r/' prefix)
+        title (str): Subreddit title (for logging purposes)
+        db_path (str): SQLite database file to load the posts into
     
+    Returns:
+        str: Success message describing the completed run
+    """
     # EXTRACT: Fetch posts from Reddit API
     data, subreddit_title = extract_data(subreddit, title)
     
@@ -81,10 +214,20 @@ if __name__ == "__main__":
     df = transform_data(data)
     
     # LOAD: Save data to SQLite database
-    load_data(df)
+    load_data(df, db_path)
     
-    # Print success message with subreddit info
+    # Build success message with subreddit info
     message = f"ETL process completed successfully for {subreddit}!"
     if subreddit_title:
         message += f" ({subreddit_title})"
-    print(message) 
+    return message
+
+if __name__ == "__main__":
+    # Get subreddit name from command line argument (default: 'r/India')
+    subreddit = sys.argv[1] if len(sys.argv) > 1 else 'r/India'
+    
+    # Get subreddit title from command line argument (optional)
+    title = sys.argv[2] if len(sys.argv) > 2 else ''
+    
+    # Run the pipeline and print success message
+    print(run(subreddit, title))
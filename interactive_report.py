@@ -6,128 +6,20 @@ This script creates an interactive dashboard with:
 Both charts include clickable post titles that open Reddit posts in new tabs.
 """
 
+import os
+import re
 import sqlite3
-import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-
-# ===== EXTRACT DATA FROM DATABASE =====
-# Connect to SQLite database containing Reddit posts
-conn = sqlite3.connect('posts.db')
-
-# Query the top 10 posts with relevant columns
-# SUBSTR() truncates title to first 50 characters
-# datetime() converts Unix timestamp to readable format
-df = pd.read_sql_query("""
-SELECT 
-  SUBSTR(title, 1, 50) AS title,
-  author,
-  url,
-  score,
-  num_comments,
-  ups,
-  subreddit_name_prefixed,
-  datetime(created_utc, 'unixepoch') AS date
-FROM posts
-ORDER BY score DESC
-LIMIT 10
-""", conn)
-conn.close()
-
-# ===== PREPARE DATA FOR VISUALIZATION =====
-# Sort by ups (upvotes) in descending order (highest first)
-df = df.sort_values('ups', ascending=False)
-
-# Reverse the dataframe for proper Plotly horizontal bar display
-# (Plotly draws first item at bottom, so we reverse to show highest on top)
-df_plot = df.iloc[::-1].reset_index(drop=True)
-
-# Create clickable HTML anchor tags for post titles
-# Each title becomes a link that opens the Reddit post in a new tab
-df_plot['title_link'] = df_plot.apply(
-    lambda row: f'<a href="{row["url"]}" target="_blank">{row["title"]}</a>',
-    axis=1
-)
-
-# ===== CREATE FIGURE WITH TWO SUBPLOTS =====
-# Create a 2-row, 1-column subplot layout for vertical stacking
-fig = make_subplots(
-    rows=2, cols=1,
-    subplot_titles=("Most Upvoted Posts", "Most Commented Posts"),
-    specs=[[{"type": "bar"}], [{"type": "bar"}]]
-)
-
-# ===== CHART 1: MOST UPVOTED POSTS (TOP) =====
-# Add horizontal bar chart for upvotes
-fig.add_trace(
-    go.Bar(
-        y=df_plot['title_link'],  # Y-axis: clickable post titles (HTML links)
-        x=df_plot['ups'],  # X-axis: number of upvotes
-        orientation='h',  # Horizontal bars
-        name='Upvotes',
-        marker_color='steelblue',  # Blue color for upvotes
-        text=df_plot['ups'],  # Show upvote count on bars
-        textposition='outside',  # Place text outside bars
-        customdata=df_plot[['title', 'author']],  # Data for hover display
-        # Hover template shows title and author (without HTML tags)
-        hovertemplate='<b>%{customdata[0]}</b><br>By: %{customdata[1]}<br>Upvotes: %{x}<extra></extra>'
-    ),
-    row=1, col=1
-)
-
-# ===== CHART 2: MOST COMMENTED POSTS (BOTTOM) =====
-# Sort by num_comments in descending order (highest comments first)
-df_comments = df.sort_values('num_comments', ascending=False)
-
-# Reverse for proper Plotly horizontal bar display
-df_comments = df_comments.iloc[::-1].reset_index(drop=True)
-
-# Create clickable titles for comments chart
-df_comments['title_link'] = df_comments.apply(
-    lambda row: f'<a href="{row["url"]}" target="_blank">{row["title"]}</a>',
-    axis=1
-)
-
-# Add horizontal bar chart for comments
-fig.add_trace(
-    go.Bar(
-        y=df_comments['title_link'],  # Y-axis: clickable post titles (HTML links)
-        x=df_comments['num_comments'],  # X-axis: number of comments
-        orientation='h',  # Horizontal bars
-        name='Comments',
-        marker_color='coral',  # Coral/orange color for comments
-        text=df_comments['num_comments'],  # Show comment count on bars
-        textposition='outside',  # Place text outside bars
-        customdata=df_comments[['title', 'author']],  # Data for hover display
-        # Hover template shows title and author (without HTML tags)
-        hovertemplate='<b>%{customdata[0]}</b><br>By: %{customdata[1]}<br>Comments: %{x}<extra></extra>'
-    ),
-    row=2, col=1
-)
-
-# ===== UPDATE AXES LABELS =====
-# Set X-axis label for upvotes chart
-fig.update_xaxes(title_text="No. of Upvotes", row=1, col=1)
-
-# Set X-axis label for comments chart
-fig.update_xaxes(title_text="No. of Comments", row=2, col=1)
-
-# Set Y-axis label for both charts
-fig.update_yaxes(title_text="Post Title", row=1, col=1)
-fig.update_yaxes(title_text="Post Title", row=2, col=1)
-
-# ===== GENERATE AND SAVE HTML =====
-# Get the subreddit name from the first row (all rows have the same subreddit)
-subreddit_name = df['subreddit_name_prefixed'].iloc[0] if len(df) > 0 else 'Reddit'
-
-# Convert Plotly figure to HTML (full page with Plotly library from CDN)
-fig_html = fig.to_html(full_html=True, include_plotlyjs='cdn')
-
-# Enhance HTML with CSS styling for clickable links and heading
-# This makes the y-axis labels (with links) properly styled and clickable
-enhanced_html = fig_html.replace(
-    '</head>',
-    '''<style>
+import tempfile
+import orjson
+import plotly.io as pio
+from plotly.offline import get_plotlyjs_version
+
+# ===== STATIC HTML SHELL =====
+# Page template built once at import time: CSS for clickable links and heading,
+# back button, and Plotly library from CDN. Each report only fills in the
+# subreddit name and the figure JSON.
+_SHELL = '''<html>
+<head><meta charset="utf-8" /><style>
     .ytick a { color: #0066cc; text-decoration: underline; cursor: pointer; }
     .ytick a:hover { color: #0044aa; }
     h1 { text-align: center; color: #333; font-family: Arial, sans-serif; margin: 20px 0; }
@@ -146,23 +38,189 @@ enhanced_html = fig_html.replace(
     .back-button:hover { background-color: #0044aa; }
     .header-container { text-align: center; }
     </style>
-    </head>'''
-)
-
-# Insert heading with subreddit name and back button at the beginning of the body
-enhanced_html = enhanced_html.replace(
-    '<body>',
-    f'''<body>
+    <script charset="utf-8" src="https://cdn.plot.ly/plotly-''' + get_plotlyjs_version() + '''.min.js"></script>
+    </head>
+<body>
     <div class="header-container">
         <a href="/" class="back-button">← Back to Dashboard</a>
-        <h1>Top 10 Reddit Posts for {subreddit_name}</h1>
-    </div>'''
+        <h1>Top 10 Reddit Posts for {SUBREDDIT}</h1>
+    </div>
+    <div id="chart" class="plotly-graph-div" style="height:100%; width:100%;"></div>
+    <script type="text/javascript">
+        var figure = {FIGURE};
+        Plotly.newPlot("chart", figure.data, figure.layout, {"responsive": true});
+    </script>
+</body>
+</html>'''
+
+# Matches the shell placeholders so both are filled in one pass over the template
+_PLACEHOLDER = re.compile(r'\{(SUBREDDIT|FIGURE)\}')
+
+# Default Plotly theme, resolved once so every figure is styled like go.Figure output
+_TEMPLATE = pio.templates[pio.templates.default].to_plotly_json()
+
+# Gap between the two charts as a fraction of the figure height; make_subplots
+# uses 0.5 / rows when subplot titles are set, so 0.25 for our 2 rows
+_VERTICAL_SPACING = 0.25
+
+# Height of each chart: the two charts split what is left after the gap
+_CHART_HEIGHT = (1.0 - _VERTICAL_SPACING) / 2
+
+# Query the top 10 posts by one metric with relevant columns
+# SUBSTR() truncates title to first 50 characters
+# The outer ORDER BY returns them ascending for proper Plotly horizontal bar display
+# (Plotly draws first item at bottom, so ascending order shows highest on top)
+_TOP_POSTS_SQL = """
+SELECT * FROM (
+  SELECT 
+    SUBSTR(title, 1, 50) AS title,
+    author,
+    url,
+    num_comments,
+    ups,
+    subreddit_name_prefixed
+  FROM posts
+  ORDER BY {column} DESC
+  LIMIT 10
 )
+ORDER BY {column}
+"""
+
+def query_top_posts(conn: sqlite3.Connection, column: str) -> dict:
+    """
+    Fetch the top 10 posts by a metric as plain column lists.
+    
+    Args:
+        conn (sqlite3.Connection): Open connection to the posts database
+        column (str): Column to rank posts by ('ups' or 'num_comments')
+    
+    Returns:
+        dict: Column name -> list of values, in ascending order of column
+    """
+    cur = conn.execute(_TOP_POSTS_SQL.format(column=column))
+    rows = cur.fetchall()
+    names = [desc[0] for desc in cur.description]
+    posts = {name: [row[i] for row in rows] for i, name in enumerate(names)}
+    
+    # Create clickable HTML anchor tags for post titles
+    # Each title becomes a link that opens the Reddit post in a new tab
+    posts['title_link'] = [f'<a href="{url}" target="_blank">{title}</a>'
+                           for url, title in zip(posts['url'], posts['title'])]
+    return posts
+
+def _subplot_title(text: str, y: float) -> dict:
+    """
+    Build a subplot title annotation centred above a chart.
+    
+    Args:
+        text (str): Title text
+        y (float): Paper y-coordinate of the top of the chart
+    
+    Returns:
+        dict: Plotly layout annotation
+    """
+    return {'text': text, 'font': {'size': 16}, 'showarrow': False,
+            'x': 0.5, 'xanchor': 'center', 'xref': 'paper',
+            'y': y, 'yanchor': 'bottom', 'yref': 'paper'}
+
+def generate(db_path='posts.db', output_path='interactive_report.html') -> None:
+    """
+    Build the interactive report from a posts database and write it as HTML.
+    
+    Args:
+        db_path (str): SQLite database file written by the ETL
+        output_path (str): HTML file to write the report to
+    """
+    # ===== EXTRACT DATA FROM DATABASE =====
+    # Connect read-only to SQLite database containing Reddit posts
+    # (WAL mode, so this never blocks a concurrent ETL write)
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+
+    # Let SQLite rank the top 10 posts for each chart
+    top_ups = query_top_posts(conn, 'ups')
+    top_comments = query_top_posts(conn, 'num_comments')
+    conn.close()
+
+    # ===== CREATE FIGURE WITH TWO SUBPLOTS =====
+    # Traces and layout are plain dicts serialized straight to JSON, which skips
+    # the attribute validation go.Bar / make_subplots run on every property.
+    # Axes x/y hold the top chart and x2/y2 the bottom one (2 rows, 1 column).
+
+    # ===== CHART 1: MOST UPVOTED POSTS (TOP) =====
+    # Horizontal bar chart for upvotes
+    upvotes_trace = {
+        'type': 'bar',
+        'y': top_ups['title_link'],  # Y-axis: clickable post titles (HTML links)
+        'x': top_ups['ups'],  # X-axis: number of upvotes
+        'orientation': 'h',  # Horizontal bars
+        'name': 'Upvotes',
+        'marker': {'color': 'steelblue'},  # Blue color for upvotes
+        'text': top_ups['ups'],  # Show upvote count on bars
+        'textposition': 'outside',  # Place text outside bars
+        'customdata': list(zip(top_ups['title'], top_ups['author'])),  # Data for hover display
+        # Hover template shows title and author (without HTML tags)
+        'hovertemplate': '<b>%{customdata[0]}</b><br>By: %{customdata[1]}<br>Upvotes: %{x}<extra></extra>',
+        'xaxis': 'x',
+        'yaxis': 'y'
+    }
 
-# Write the enhanced HTML to file
-with open('interactive_report.html', 'w', encoding='utf-8') as f:
-    f.write(enhanced_html)
+    # ===== CHART 2: MOST COMMENTED POSTS (BOTTOM) =====
+    # Horizontal bar chart for comments
+    comments_trace = {
+        'type': 'bar',
+        'y': top_comments['title_link'],  # Y-axis: clickable post titles (HTML links)
+        'x': top_comments['num_comments'],  # X-axis: number of comments
+        'orientation': 'h',  # Horizontal bars
+        'name': 'Comments',
+        'marker': {'color': 'coral'},  # Coral/orange color for comments
+        'text': top_comments['num_comments'],  # Show comment count on bars
+        'textposition': 'outside',  # Place text outside bars
+        'customdata': list(zip(top_comments['title'], top_comments['author'])),  # Data for hover display
+        # Hover template shows title and author (without HTML tags)
+        'hovertemplate': '<b>%{customdata[0]}</b><br>By: %{customdata[1]}<br>Comments: %{x}<extra></extra>',
+        'xaxis': 'x2',
+        'yaxis': 'y2'
+    }
 
-# Print success message
-# print("Interactive report saved as 'interactive_report.html' (with clickable title links)")
-# print("Open the file in your browser and click titles to open posts!")
+    # ===== LAYOUT AND AXES LABELS =====
+    layout = {
+        'template': _TEMPLATE,
+        # Top chart occupies the upper 37.5% and bottom chart the lower 37.5%,
+        # separated by _VERTICAL_SPACING (same domains make_subplots produced)
+        'xaxis': {'anchor': 'y', 'domain': [0.0, 1.0], 'title': {'text': 'No. of Upvotes'}},
+        'yaxis': {'anchor': 'x', 'domain': [1.0 - _CHART_HEIGHT, 1.0], 'title': {'text': 'Post Title'}},
+        'xaxis2': {'anchor': 'y2', 'domain': [0.0, 1.0], 'title': {'text': 'No. of Comments'}},
+        'yaxis2': {'anchor': 'x2', 'domain': [0.0, _CHART_HEIGHT], 'title': {'text': 'Post Title'}},
+        # Subplot titles, positioned above each chart
+        'annotations': [
+            _subplot_title('Most Upvoted Posts', 1.0),
+            _subplot_title('Most Commented Posts', _CHART_HEIGHT)
+        ]
+    }
+    figure = {'data': [upvotes_trace, comments_trace], 'layout': layout}
+
+    # ===== GENERATE AND SAVE HTML =====
+    # Get the subreddit name from the first row (all rows have the same subreddit)
+    subreddit_name = top_ups['subreddit_name_prefixed'][0] if top_ups['subreddit_name_prefixed'] else 'Reddit'
+
+    # Serialize only the figure (traces + layout) and drop it into the prebuilt page
+    # Escape '</' so a post title can never close the surrounding <script> tag
+    figure_json = orjson.dumps(figure).decode('utf-8').replace('</', '<\\/')
+    values = {'SUBREDDIT': subreddit_name, 'FIGURE': figure_json}
+    enhanced_html = _PLACEHOLDER.sub(lambda m: values[m.group(1)], _SHELL)
+
+    # Write the enhanced HTML to a temp file and swap it in atomically,
+    # so the report is never served half-written
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.abspath(output_path)))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(enhanced_html)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+if __name__ == "__main__":
+    generate()
+    # print("Interactive report saved as 'interactive_report.html' (with clickable title links)")
+    # print("Open the file in your browser and click titles to open posts!")
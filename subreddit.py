@@ -1,24 +1,58 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+import os
+import sys
+import tempfile
 
 url = "https://www.reddit.com/subreddits/popular.json?limit=100"
-headers = {'User-agent': 'python-script'}
-
-response = requests.get(url, headers=headers)
-data = response.json()
-
-subreddits = []
-for sub in data['data']['children']:
-    name = sub['data']['display_name_prefixed']
-    subs = sub['data']['subscribers']
-    title = sub['data']['title']
-    subreddits.append({
-        'name': name,
-        'subscribers': subs,
-        'title': title
-    })
-    print(f"{name}: {subs:,}")
-
-# Save to JSON file for frontend to use
-with open('subreddits.json', 'w') as f:
-    json.dump(subreddits, f)
\ No newline at end of file
+headers = {'User-agent': 'python-script', 'Accept-Encoding': 'gzip, deflate'}
+
+# Shared HTTP session so repeated fetches reuse the Reddit connection
+_SESSION = requests.Session()
+_SESSION.headers.update(headers)
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+def fetch() -> list:
+    """
+    Fetch popular subreddits from Reddit and cache them to subreddits.json.
+
+    Returns:
+        list: Subreddits [{'name': 'r/...', 'subscribers': int, 'title': str}, ...]
+    """
+    response = _SESSION.get(url, timeout=10)
+    data = orjson.loads(response.content)
+
+    subreddits = []
+    for sub in data['data']['children']:
+        name = sub['data']['display_name_prefixed']
+        subs = sub['data']['subscribers']
+        title = sub['data']['title']
+        subreddits.append({
+            'name': name,
+            'subscribers': subs,
+            'title': title
+        })
+
+    # Save to JSON file for frontend to use, via a temp file swapped in
+    # atomically so readers never see a half-written list
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.abspath('subreddits.json')))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps(subreddits))
+        os.replace(tmp_path, 'subreddits.json')
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    return subreddits
+
+if __name__ == "__main__":
+    # Print all subreddits in a single write instead of one print per row
+    lines = [f"{sub['name']}: {sub['subscribers']:,}" for sub in fetch()]
+    sys.stdout.write("\n".join(lines) + "\n")
@@ -0,0 +1,9 @@
+"""
+WSGI entry point for production serving.
+
+Run with multiple workers and threads so a long ETL or report run does not
+block other requests, e.g.:
+    gunicorn -w $(nproc) -k gthread --threads 8 --timeout 90 wsgi:app
+"""
+
+from app import app